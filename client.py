@@ -5,21 +5,33 @@ This program lets you change settings as well as shut the alarm off once it's st
 """
 
 import configparser
+import functools
 import socket
 import ast
+import json
 import platform
 import os
 import time
-import tkinter
-import random
-
-import numpy as np
-import pyautogui
 import sys
 
+# tkinter, random, numpy and pyautogui are only needed for the awake test, and are therefore imported by the functions
+# using them. This keeps the startup of management mode fast, pyautogui in particular being slow to import.
+
 SETTINGS_PATH = "settings.ini"
 MIN_LINE_LENGTH = 5
 BORDER_MARGIN = 10
+TIMEZONE_TIME_MAX_AGE = 1
+MAX_INPUT_RETRY_DELAY = 5
+# How many milliseconds of mouse movement are measured against the precision mouse threshold
+CHEATING_CHECK_INTERVAL = 100
+
+# The colors used in the awake test, coded by priority so that the highest code wins where rectangles overlap
+WHITE = 0
+BLACK = 1
+GREEN = 2
+RED = 3
+# The RGB value of each color code, used when drawing the pixel grid onto the canvas
+COLOR_PALETTE = (255, 255, 255, 0, 0, 0, 0, 255, 0, 255, 0, 0)
 
 
 def main():
@@ -31,7 +43,7 @@ def main():
     """
     # Initialization
     server_address, server_port, window_height, window_width, window_x_margin, window_y_margin,\
-        mouse_y_offset, mouse_x_offset, mock_test, alarm_state, line_thickness, precision_mouse_threshold = initialize()
+        mock_test, alarm_state, line_thickness, precision_mouse_threshold = initialize()
 
     # If user wants a mock test
     if mock_test.lower() in ["true", "1", "yes"]:
@@ -41,8 +53,8 @@ def main():
     if alarm_state == 1:
 
         # Test if the user is awake
-        awake_test(window_height, window_width, window_x_margin, window_y_margin, mouse_y_offset, mouse_x_offset,
-                   line_thickness, precision_mouse_threshold)
+        awake_test(window_height, window_width, window_x_margin, window_y_margin, line_thickness,
+                   precision_mouse_threshold)
 
         # After having completed the awoke_test properly, stop the alarm
         set_alarm_state(server_address, server_port, 0)
@@ -69,11 +81,11 @@ def initialize():
     """
     Loads settings from settings.ini and gets the current state of the alarm.
     :return: server_address (str), server_port(int), window_height (int), window_width (int), window_title_margin (int),
-    mouse_y_offset (int), mouse_x_offset (int), mock_test (str), alarm_state (int)
+    mock_test (str), alarm_state (int)
     """
     # Load settings from settings.ini
     server_address, server_port, window_height, window_width, window_x_margin, window_y_margin,\
-        mouse_y_offset, mouse_x_offset, mock_test = load_settings()
+        mock_test = load_settings()
 
     # Get server state
     alarm_state = get_alarm_state(server_address, server_port)
@@ -85,31 +97,27 @@ def initialize():
     precision_mouse_threshold = get_precision_mouse_threshold(server_address, server_port)
 
     return server_address, server_port, window_height, window_width, window_x_margin, window_y_margin,\
-        mouse_y_offset, mouse_x_offset, mock_test, alarm_state, line_thickness, precision_mouse_threshold
+        mock_test, alarm_state, line_thickness, precision_mouse_threshold
 
 
 def load_settings():
     """
     Loads settings.ini and returns its information.
-    :return: server_address (str), server_port (str), window_height (int), window_width (int),
-    window_title_margin (int), mouse_y_offset (int), mouse_x_offset (int), mock_test (str)
+    :return: server_address (str), server_port (int), window_height (int), window_width (int),
+    window_title_margin (int), mock_test (str)
     """
     # Load settings.ini
     config = configparser.ConfigParser()
     config.read(SETTINGS_PATH)
-    config.sections()
     server_address = config['SERVER']['Address']
-    server_port = config['SERVER']['Port']
+    server_port = int(config['SERVER']['Port'])
     window_height = int(config['CLIENT']['Window height'])
     window_width = int(config['CLIENT']['Window width'])
     window_x_margin = int(config['CLIENT']['Window x margin'])
     window_y_margin = int(config['CLIENT']['Window y margin'])
-    mouse_y_offset = int(config['CLIENT']['Mouse y offset'])
-    mouse_x_offset = int(config['CLIENT']['Mouse x offset'])
     mock_test = config['CLIENT']['Mock test']
 
-    return server_address, server_port, window_height, window_width, window_x_margin, window_y_margin,\
-        mouse_y_offset, mouse_x_offset, mock_test
+    return server_address, server_port, window_height, window_width, window_x_margin, window_y_margin, mock_test
 
 
 """
@@ -119,8 +127,8 @@ def load_settings():
 """
 
 
-def awake_test(window_height, window_width, window_x_margin, window_y_margin, mouse_y_offset, mouse_x_offset,
-               line_thickness, precision_mouse_threshold):
+def awake_test(window_height, window_width, window_x_margin, window_y_margin, line_thickness,
+               precision_mouse_threshold):
     """
     Gives the user challenges until one is overcome, in which case we assume the user is awake enough to not fall back
     to sleep.
@@ -132,10 +140,6 @@ def awake_test(window_height, window_width, window_x_margin, window_y_margin, mo
     :type window_x_margin: int
     :param window_y_margin: How many pixel thick the window border is in the y direction.
     :type window_y_margin: int
-    :param mouse_y_offset: How many pixels to offset the location of the mouse in the y direction.
-    :type mouse_y_offset: int
-    :param mouse_x_offset: How many pixels to offset the location of the mouse in the x direction.
-    :type mouse_x_offset: int
     :param line_thickness: How many pixels wide the lines will be.
     :type line_thickness: int
     :param precision_mouse_threshold: The threshold for which the mouse movement will be recognized as cheating.
@@ -143,29 +147,37 @@ def awake_test(window_height, window_width, window_x_margin, window_y_margin, mo
     :return: None
     """
     # Create GUI
-    window, canvas = create_awake_test_gui(window_height, window_width)
+    window, canvas, pixel_grid = create_awake_test_gui(window_height, window_width)
 
     # Create test
-    start, east_lines, west_lines, south_lines, north_lines = create_test(canvas, line_thickness)
+    start, east_lines, west_lines, south_lines, north_lines = create_test(canvas, pixel_grid, line_thickness)
 
-    # Run tests
-    awake = tkinter.BooleanVar(canvas, False, "awake")
-    while not awake.get():
-        awake.set(run_test(canvas, start, window_x_margin, window_y_margin, mouse_y_offset, mouse_x_offset,
-                           line_thickness, precision_mouse_threshold))
+    # Draw the whole test at once, rather than redrawing the canvas while it's being built
+    canvas.update()
+
+    # Run test
+    if not run_test(window, canvas, pixel_grid, start, window_x_margin, window_y_margin, line_thickness,
+                    precision_mouse_threshold):
+        # The window was closed before reaching the goal, so quit without turning the alarm off
+        window.destroy()
+        sys.exit()
 
     print("Congratulations. You passed the test!")
 
 
 def create_awake_test_gui(window_height, window_width):
     """
-    Creates the GUI
+    Creates the GUI, along with the pixel grid which the test is drawn into.
     :param window_height: How many pixels high the GUI should be.
     :type window_height: int
     :param window_width: How many pixels wide the GUI should be.
     :type window_width: int
-    :return: window (tkinter.Tk), canvas (tkinter.Canvas)
+    :return: window (tkinter.Tk), canvas (tkinter.Canvas), pixel_grid (np.array)
     """
+    import tkinter
+
+    import numpy as np
+
     # Sets minimum window height
     if window_height < 36:
         window_height = 36
@@ -185,44 +197,52 @@ def create_awake_test_gui(window_height, window_width):
     canvas.grid(row=0, column=0)
     canvas.update()
 
-    return window, canvas
+    # One color code per canvas pixel, indexed as [y, x]
+    pixel_grid = np.zeros((canvas.winfo_height(), canvas.winfo_width()), dtype=np.uint8)
 
+    return window, canvas, pixel_grid
 
-def create_test(canvas, line_thickness):
+
+def create_test(canvas, pixel_grid, line_thickness):
     """
     Fills the canvas with a graphical test, and a success condition.
     :param canvas: The GUI in which the test is drawn onto.
     :type canvas: tkinter.Canvas
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
     :param line_thickness: How many pixels wide the lines will be.
     :type line_thickness: int
-    :return: east_lines (list of tkinter.Canvas.create_rectangle), west_lines (list of tkinter.Canvas.create_rectangle),
-    south_lines (list of tkinter.Canvas.create_rectangle), north_lines (list of tkinter.Canvas.create_rectangle)
+    :return: start (tuple), east_lines (list of tuple), west_lines (list of tuple), south_lines (list of tuple),
+    north_lines (list of tuple)
     """
+    import random
+
     # Choose which side the mouse pointer shall start on (Left: 1, Top: 2)
     start_side = random.randint(1, 2)
 
-    size = np.array([canvas.winfo_width() - 3 - BORDER_MARGIN, canvas.winfo_height() - 3 - BORDER_MARGIN])
+    canvas_width, canvas_height = canvas.winfo_width(), canvas.winfo_height()
+    size = (canvas_width - 3 - BORDER_MARGIN, canvas_height - 3 - BORDER_MARGIN)
 
     # Create start and end
     if start_side == 1:
         # If starting side is left
-        start = np.array([BORDER_MARGIN, random.randint(BORDER_MARGIN, size[1])])
-        canvas.create_rectangle(start[0], start[1], start[0] + line_thickness * 2, start[1] + line_thickness * 2,
-                                fill="green", outline="green")
+        start = (BORDER_MARGIN, random.randint(BORDER_MARGIN, size[1]))
+        fill_pixel_grid(pixel_grid, start[0], start[1], start[0] + line_thickness * 2, start[1] + line_thickness * 2,
+                        GREEN)
 
-        end = np.array([size[0], random.randint(BORDER_MARGIN, size[1])])
-        end_block = canvas.create_rectangle(end[0], end[1], end[0] - line_thickness * 2, end[1] + line_thickness * 2,
-                                            fill="red", outline="red")
+        end = (size[0], random.randint(BORDER_MARGIN, size[1]))
+        end_block = (end[0] - line_thickness * 2, end[1], end[0], end[1] + line_thickness * 2)
+        fill_pixel_grid(pixel_grid, *end_block, RED)
 
     else:
         # If starting side is top
-        start = np.array([random.randint(BORDER_MARGIN, size[0]), BORDER_MARGIN])
-        canvas.create_rectangle(start[0], start[1], start[0] + line_thickness * 2, start[1] + line_thickness * 2,
-                                fill="green", outline="green")
+        start = (random.randint(BORDER_MARGIN, size[0]), BORDER_MARGIN)
+        fill_pixel_grid(pixel_grid, start[0], start[1], start[0] + line_thickness * 2, start[1] + line_thickness * 2,
+                        GREEN)
 
-        end = np.array([random.randint(BORDER_MARGIN, size[0]), size[1]])
-        end_block = canvas.create_rectangle(end[0], end[1], end[0] + line_thickness * 2, end[1] - line_thickness * 2,
-                                            fill="red", outline="red")
+        end = (random.randint(BORDER_MARGIN, size[0]), size[1])
+        end_block = (end[0], end[1] - line_thickness * 2, end[0] + line_thickness * 2, end[1])
+        fill_pixel_grid(pixel_grid, *end_block, RED)
 
     # Instantiate list for referencing lines by their direction
     east_lines = []
@@ -231,87 +251,89 @@ def create_test(canvas, line_thickness):
     north_lines = []
 
     # Create start line
-    line_end, previous_direction, path_complete = draw_line(start, end, size, canvas, end_block,
-                                                            [0, 0], east_lines, west_lines, south_lines, north_lines)
-    canvas.update()
+    line_end, previous_direction, path_complete = draw_line(start, end, size, pixel_grid, end_block,
+                                                            (0, 0), east_lines, west_lines, south_lines, north_lines)
 
     # While the previous line doesn't touch the goal
     while not path_complete:
         # Draw a new line
-        line_end, previous_direction, path_complete = draw_line(line_end, end, size, canvas, end_block,
+        line_end, previous_direction, path_complete = draw_line(line_end, end, size, pixel_grid, end_block,
                                                                 previous_direction, east_lines, west_lines,
                                                                 south_lines, north_lines)
-        canvas.update()
 
     # After the path is complete, increase the thickness of all the lines
-    east_lines, west_lines, south_lines, north_lines = increase_line_thickness(canvas, east_lines, west_lines,
+    east_lines, west_lines, south_lines, north_lines = increase_line_thickness(pixel_grid, east_lines, west_lines,
                                                                                south_lines, north_lines,
                                                                                line_thickness)
 
+    # Show the finished test on the canvas
+    draw_pixel_grid(canvas, pixel_grid)
+
     return start, east_lines, west_lines, south_lines, north_lines
 
 
-def draw_line(start, end, size, canvas, end_block, previous_direction,
+def draw_line(start, end, size, pixel_grid, end_block, previous_direction,
               east_lines, west_lines, south_lines, north_lines):
     """
     Draws a line in such a way as to make a connection between start and end.
     :param start: Where the line will have to start.
-    :type start: np.array
+    :type start: tuple
     :param end: Where the new line will try to get closer to.
-    :type end: np.array
+    :type end: tuple
     :param size: The width and height of the game area.
-    :type size: np.array
-    :param canvas: The GUI in which the challenge happens.
-    :type canvas: tkinter.TK
-    :param end_block: The area in which any pixel marks the goal, and the end of any new line.
-    :type end_block: tkinter.Canvas.create_rectangle
+    :type size: tuple
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
+    :param end_block: The area in which any pixel marks the goal, and the end of any new line, as (x0, y0, x1, y1).
+    :type end_block: tuple
     :param previous_direction: The direction in which the previous line was headed.
-    :type previous_direction: np.array
-    :param east_lines: An array containing a reference to all the lines going east.
+    :type previous_direction: tuple
+    :param east_lines: A list containing the coordinates of all the lines going east.
     :type east_lines: list
-    :param west_lines: An array containing a reference to all the lines going west.
+    :param west_lines: A list containing the coordinates of all the lines going west.
     :type west_lines: list
-    :param south_lines: An array containing a reference to all the lines going south.
+    :param south_lines: A list containing the coordinates of all the lines going south.
     :type south_lines: list
-    :param north_lines: An array containing a reference to all the lines going north.
+    :param north_lines: A list containing the coordinates of all the lines going north.
     :type north_lines: list
-    :return: line_end (np.array), direction (np.array), covers_goal (boolean)
+    :return: line_end (tuple), direction (tuple), covers_goal (boolean)
     """
+    import random
+
     # Get direction
     direction = determine_direction(start, end, previous_direction)
 
-    # Get line length
-    max_direction_length = np.multiply(size, direction)
-    max_direction_length = max_direction_length[max_direction_length != 0]
-    max_direction_length = abs(int(max_direction_length[0]))
+    # Get line length (only one of the direction components is non-zero)
+    max_direction_length = abs(size[0] * direction[0] + size[1] * direction[1])
     random_line_length = random.randint(MIN_LINE_LENGTH, max_direction_length)
 
     # Calculate line end
-    line_end = np.add(start, np.multiply(direction, random_line_length))
-    if line_end[0] > size[0] or line_end[0] < BORDER_MARGIN:
-        line_end[0] = size[0]
-    if line_end[1] > size[1] or line_end[1] < BORDER_MARGIN:
-        line_end[1] = size[1]
-
-    # Draw line in the determined direction
+    line_end_x = start[0] + direction[0] * random_line_length
+    line_end_y = start[1] + direction[1] * random_line_length
+    if line_end_x > size[0] or line_end_x < BORDER_MARGIN:
+        line_end_x = size[0]
+    if line_end_y > size[1] or line_end_y < BORDER_MARGIN:
+        line_end_y = size[1]
+    line_end = (line_end_x, line_end_y)
+
+    # Draw line in the determined direction, with its coordinates ordered as (left, top, right, bottom)
+    line = (min(start[0], line_end[0]), min(start[1], line_end[1]), max(start[0], line_end[0]),
+            max(start[1], line_end[1]))
+    fill_pixel_grid(pixel_grid, *line, BLACK)
     if direction[0] == 1:
-        east_lines.append(canvas.create_rectangle(start[0], start[1], line_end[0], line_end[1],
-                                                  fill="black"))
+        east_lines.append(line)
     elif direction[0] == -1:
-        west_lines.append(canvas.create_rectangle(start[0], start[1], line_end[0], line_end[1],
-                                                  fill="black"))
+        west_lines.append(line)
     elif direction[1] == 1:
-        south_lines.append(canvas.create_rectangle(start[0], start[1], line_end[0], line_end[1],
-                                                   fill="black"))
+        south_lines.append(line)
     elif direction[1] == -1:
-        north_lines.append(canvas.create_rectangle(start[0], start[1], line_end[0], line_end[1],
-                                                   fill="black"))
+        north_lines.append(line)
 
     # Check if the new line overlaps the goal
-    if end_block in canvas.find_overlapping(start[0], start[1], line_end[0], line_end[1]):
-        covers_goal = True
-    else:
+    if line[2] < end_block[0] or line[0] > end_block[2] or line[3] < end_block[1] or line[1] > end_block[3]:
         covers_goal = False
+    else:
+        covers_goal = True
 
     return line_end, direction, covers_goal
 
@@ -320,237 +342,275 @@ def determine_direction(source, destination, previous_direction):
     """
     Determines the cardinal direction that gives the shortest path between point a (source) and b (destination)
     :param source: Point A
-    :type source: np.array
+    :type source: tuple
     :param destination: Point B
-    :type destination: np.array
+    :type destination: tuple
     :param previous_direction: The direction which was last used.
-    :type previous_direction: np.array
-    :return: np.array
+    :type previous_direction: tuple
+    :return: direction (tuple)
     """
     # Find vector from source to destination
-    direct_path = np.subtract(destination, source)
+    path_x = destination[0] - source[0]
+    path_y = destination[1] - source[1]
 
     # Return most impacting direction as a scalar vector
-    if abs(direct_path[0]) >= abs(direct_path[1]):
-        if direct_path[0] >= 0:
-            direction = np.array([1, 0])
+    if abs(path_x) >= abs(path_y):
+        if path_x >= 0:
+            direction = (1, 0)
         else:
-            direction = np.array([-1, 0])
+            direction = (-1, 0)
     else:
-        if direct_path[1] >= 0:
-            direction = np.array([0, 1])
+        if path_y >= 0:
+            direction = (0, 1)
         else:
-            direction = np.array([0, -1])
-
-    # Get the opposite direction of the previous one
-    opposite_of_previous_direction = previous_direction
-    opposite_of_previous_direction = opposite_of_previous_direction[opposite_of_previous_direction != 0] * -1
+            direction = (0, -1)
 
-    # If the proposed new direction is perpendicular to the previous one, go south
-    if np.array_equal(direction, previous_direction) or np.array_equal(direction, opposite_of_previous_direction):
-        x = direction[0]
-        y = direction[1]
-        direction = np.array([y, x])
+    # If the proposed new direction is the same as the previous one, turn
+    if direction[0] == previous_direction[0] and direction[1] == previous_direction[1]:
+        direction = (direction[1], direction[0])
 
     return direction
 
 
-def increase_line_thickness(canvas, east_lines, west_lines, south_lines, north_lines, increase_factor):
+def increase_line_thickness(pixel_grid, east_lines, west_lines, south_lines, north_lines, increase_factor):
     """
     Increases the thickness of all drawn lines.
-    :param canvas: The GUI in which the challenge happens.
-    :type canvas: tkinter.TK
-    :param east_lines: An array containing a reference to all the lines going east.
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
+    :param east_lines: A list containing the coordinates of all the lines going east.
     :type east_lines: list
-    :param west_lines: An array containing a reference to all the lines going west.
+    :param west_lines: A list containing the coordinates of all the lines going west.
     :type west_lines: list
-    :param south_lines: An array containing a reference to all the lines going south.
+    :param south_lines: A list containing the coordinates of all the lines going south.
     :type south_lines: list
-    :param north_lines: An array containing a reference to all the lines going north.
+    :param north_lines: A list containing the coordinates of all the lines going north.
     :type north_lines: list
     :param increase_factor: How many pixels to increase the line thickness by.
     :type increase_factor: int
-    :return: new_east_lines (list), new_west_lines (list), new_south_lines (list), new_north_lines (list)
+    :return: east_lines (list), west_lines (list), south_lines (list), north_lines (list)
     """
-    # Instantiate the lists which will contain references to the new, thicker, lines.
-    new_east_lines = []
-    new_west_lines = []
-    new_south_lines = []
-    new_north_lines = []
-
-    # Go through each line going in this direction, draw a new line which is thicker, then delete the old one
-    for line in east_lines:
-        x0, y0, x1, y1 = canvas.coords(line)
-        y1 += increase_factor
-        x1 += increase_factor
-
-        canvas.delete(line)
-        new_east_lines.append(canvas.create_rectangle(x0, y0, x1, y1, fill="black"))
+    # Replace every line with a thicker one, in place
+    for lines in (east_lines, west_lines, south_lines, north_lines):
+        for index, (x0, y0, x1, y1) in enumerate(lines):
+            lines[index] = (x0, y0, x1 + increase_factor, y1 + increase_factor)
+            fill_pixel_grid(pixel_grid, *lines[index], BLACK)
 
-    # Clear the old list of the thinner lines going in this direction
-    east_lines.clear()
+    return east_lines, west_lines, south_lines, north_lines
 
-    # Go through each line going in this direction, draw a new line which is thicker, then delete the old one
-    for line in west_lines:
-        x0, y0, x1, y1 = canvas.coords(line)
-        y1 += increase_factor
-        x1 += increase_factor
 
-        canvas.delete(line)
-        new_west_lines.append(canvas.create_rectangle(x0, y0, x1, y1, fill="black"))
-
-    # Clear the old list of the thinner lines going in this direction
-    west_lines.clear()
-
-    # Go through each line going in this direction, draw a new line which is thicker, then delete the old one
-    for line in south_lines:
-        x0, y0, x1, y1 = canvas.coords(line)
-        y1 += increase_factor
-        x1 += increase_factor
-
-        canvas.delete(line)
-        new_south_lines.append(canvas.create_rectangle(x0, y0, x1, y1, fill="black"))
-
-    # Clear the old list of the thinner lines going in this direction
-    south_lines.clear()
-
-    # Go through each line going in this direction, draw a new line which is thicker, then delete the old one
-    for line in north_lines:
-        x0, y0, x1, y1 = canvas.coords(line)
-        y1 += increase_factor
-        x1 += increase_factor
-
-        canvas.delete(line)
-        new_north_lines.append(canvas.create_rectangle(x0, y0, x1, y1, fill="black"))
-
-    # Clear the old list of the thinner lines going in this direction
-    north_lines.clear()
-
-    canvas.update()
-
-    return new_east_lines, new_west_lines, new_south_lines, new_north_lines
-
-
-def run_test(canvas, start, window_x_margin, window_y_margin, mouse_y_offset, mouse_x_offset, line_thickness,
+def run_test(window, canvas, pixel_grid, start, window_x_margin, window_y_margin, line_thickness,
              precision_mouse_threshold):
     """
-    Runs the awake test.
+    Runs the awake test. The mouse pointer is checked every time it moves over the canvas, and the function returns
+    once it has reached the goal, or once the window has been closed.
+    :param window: The main window of the GUI.
+    :type window: tkinter.Tk
     :param canvas: The GUI in which the test is drawn onto.
     :type canvas: tkinter.Canvas
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
     :param start: The coordinates of the start position of the challenge.
-    :type start: np.array
+    :type start: tuple
     :param window_x_margin: How many pixel thick the window border is in the x direction.
     :type window_x_margin: int
     :param window_y_margin: How many pixel thick the window border is in the y direction.
     :type window_y_margin: int
-    :param mouse_y_offset: How many pixels to offset the location of the mouse in the y direction.
-    :type mouse_y_offset: int
-    :param mouse_x_offset: How many pixels to offset the location of the mouse in the x direction.
-    :type mouse_x_offset: int
     :param line_thickness: How many pixels wide the lines will be.
     :type line_thickness: int
     :param precision_mouse_threshold: The threshold for which the mouse movement will be recognized as cheating.
     :type precision_mouse_threshold: int
-    :return: success (boolean)
+    :return: success (boolean), which is False if the window was closed before reaching the goal
     """
+    import tkinter
+
+    import pyautogui
+
     # Place mouse pointer over start_block
     pyautogui.moveTo(start[0] + window_x_margin + line_thickness // 2,
                      start[1] + window_y_margin + line_thickness // 2)
 
-    success = False
+    success = tkinter.BooleanVar(canvas, False)
 
     previous_mouse_x, previous_mouse_y = pyautogui.position()
-
-    # While the mouse hasn't yet reached the goal
-    while not success:
-        canvas.update()
-
-        previous_mouse_x, previous_mouse_y = handle_cheating(previous_mouse_x, previous_mouse_y,
-                                                             precision_mouse_threshold)
-
-        # Find current mouse position
-        mouse_x, mouse_y = pyautogui.position()
-        mouse_x += mouse_x_offset
-        mouse_y += mouse_y_offset
-
-        # Check pixel color of mouse position
-        current_pixel_color = get_pixel_color(canvas, mouse_x, mouse_y)
-
-        if current_pixel_color == "WHITE":
+    # The time of the motion event at which the previous mouse position was sampled, set by the next motion event
+    previous_mouse_time = None
+
+    # Whether the mouse pointer has just been moved back to start, in which case its motion is ignored for a moment
+    suspended = False
+
+    def resume():
+        """
+        Starts checking the mouse pointer again after it has been moved back to start.
+        :return: None
+        """
+        nonlocal previous_mouse_x, previous_mouse_y, previous_mouse_time, suspended
+
+        previous_mouse_x, previous_mouse_y = pyautogui.position()
+        previous_mouse_time = None
+        suspended = False
+
+    def on_motion(event):
+        """
+        Checks what the mouse pointer is touching every time it moves over the canvas.
+        :param event: The motion event, which holds the position of the mouse pointer relative to the canvas.
+        :type event: tkinter.Event
+        :return: None
+        """
+        nonlocal previous_mouse_x, previous_mouse_y, previous_mouse_time, suspended
+
+        if suspended:
+            return
+
+        if previous_mouse_time is None:
+            previous_mouse_time = event.time
+
+        mouse_x, mouse_y = handle_cheating(previous_mouse_x, previous_mouse_y, event.x_root, event.y_root,
+                                           precision_mouse_threshold)
+
+        # The mouse pointer barely moves between two motion events, so its movement is measured over a fixed time
+        # window instead. A new window starts once the current one has passed, or once the mouse pointer has been
+        # moved back for cheating
+        if event.time - previous_mouse_time >= CHEATING_CHECK_INTERVAL or \
+                (mouse_x, mouse_y) != (event.x_root, event.y_root):
+            previous_mouse_x, previous_mouse_y = mouse_x, mouse_y
+            previous_mouse_time = event.time
+
+        # Check pixel color of mouse position, which may have been moved back when cheating
+        current_pixel_color = get_pixel_color(pixel_grid, event.x + mouse_x - event.x_root,
+                                              event.y + mouse_y - event.y_root)
+
+        if current_pixel_color == WHITE:
             # Touching wall
             print("You have touched the wall! Moving you back to start.")
             pyautogui.moveTo(start[0] + window_x_margin + line_thickness // 2,
                              start[1] + window_y_margin + line_thickness // 2)
-            previous_mouse_x, previous_mouse_y = pyautogui.position()
-            time.sleep(0.1)
+
+            # Give the pointer some time to settle without blocking the GUI
+            suspended = True
+            canvas.after(100, resume)
 
         # Check if in goal
-        elif current_pixel_color == "RED":
+        elif current_pixel_color == RED:
             # Reached goal
             print("You have reached the goal!")
-            success = True
+            success.set(True)
 
-        # To avoid huge system load
-        else:
-            time.sleep(0.1)
+    def on_close():
+        """
+        Stops waiting for the goal to be reached when the window is closed, since waiting doesn't end by itself when
+        the window is destroyed.
+        :return: None
+        """
+        success.set(False)
 
-    return success
+    # Only do work when the mouse actually moves, and wait until the goal has been reached or the window is closed
+    canvas.bind("<Motion>", on_motion)
+    window.protocol("WM_DELETE_WINDOW", on_close)
+    window.wait_variable(success)
+    canvas.unbind("<Motion>")
 
+    return success.get()
 
-def handle_cheating(previous_mouse_x, previous_mouse_y, precision_mouse_threshold):
-    current_mouse_x, current_mouse_y = pyautogui.position()
 
-    movement = [current_mouse_x - previous_mouse_x, current_mouse_y - previous_mouse_y]
+def handle_cheating(previous_mouse_x, previous_mouse_y, mouse_x, mouse_y, precision_mouse_threshold):
+    """
+    Moves the mouse pointer back if it has moved further than the precision mouse threshold since the previous position
+    was sampled. The previous position is kept by the caller for a fixed time window, and is not simply the position
+    of the previous motion event.
+    :param previous_mouse_x: The x coordinate of the mouse pointer on the screen at the start of the time window.
+    :type previous_mouse_x: int
+    :param previous_mouse_y: The y coordinate of the mouse pointer on the screen at the start of the time window.
+    :type previous_mouse_y: int
+    :param mouse_x: The current x coordinate of the mouse pointer on the screen.
+    :type mouse_x: int
+    :param mouse_y: The current y coordinate of the mouse pointer on the screen.
+    :type mouse_y: int
+    :param precision_mouse_threshold: The threshold for which the mouse movement will be recognized as cheating.
+    :type precision_mouse_threshold: int
+    :return: mouse_x (int), mouse_y (int), which is the mouse position after having been moved back if cheating
+    """
+    import pyautogui
 
-    new_previous_x = current_mouse_x
-    new_previous_y = current_mouse_y
+    movement_x = mouse_x - previous_mouse_x
+    movement_y = mouse_y - previous_mouse_y
+    distance_x = abs(movement_x)
+    distance_y = abs(movement_y)
 
-    if abs(movement[0]) > abs(movement[1]):
-        if abs(movement[0]) > precision_mouse_threshold:
-            pyautogui.moveTo(previous_mouse_x + movement[0] * -1, current_mouse_y)
-            new_previous_x = previous_mouse_x + movement[0] * -1
+    if distance_x > distance_y:
+        if distance_x > precision_mouse_threshold:
+            mouse_x = previous_mouse_x - movement_x
+            pyautogui.moveTo(mouse_x, mouse_y)
 
     else:
-        if abs(movement[1]) > precision_mouse_threshold:
-            pyautogui.moveTo(current_mouse_x, previous_mouse_y + movement[1] * -1)
-            new_previous_y = previous_mouse_y + movement[1] * -1
+        if distance_y > precision_mouse_threshold:
+            mouse_y = previous_mouse_y - movement_y
+            pyautogui.moveTo(mouse_x, mouse_y)
 
-    return new_previous_x, new_previous_y
+    return mouse_x, mouse_y
 
 
-def get_pixel_color(canvas, x, y):
+def get_pixel_color(pixel_grid, x, y):
     """
-    Gets the pixel color of a certain pixel in a canvas.
-    :param canvas: The canvas in question.
-    :type canvas: tkinter.Canvas
+    Gets the color code of a certain pixel in the canvas, as recorded in the pixel grid.
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
     :param x: The x coordinate of the pixel to check.
     :type x: int
     :param y: The y coordinate of the pixel to check.
     :type y: int
-    :return: string
-    """
-    # Get a list og the canvas objects overlapping the given coordinate
-    ids = canvas.find_overlapping(x, y, x, y)
-
-    # Instantiate list which will contain the color of all the overlapping widgets
-    colors = []
-
-    if len(ids) > 0:
-        for index in ids:
-            color = canvas.itemcget(index, "fill")
-            color = color.upper()
-            if color != '':
-                colors.append(color)
-
-    # Returns a color in the following priority: Red, Green, Black, White
-    if "RED" in colors:
-        return "RED"
-    elif "GREEN" in colors:
-        return "GREEN"
-    elif "BLACK" in colors:
-        return "BLACK"
-    else:
-        return "WHITE"
+    :return: color (int)
+    """
+    # Anything outside of the canvas counts as a wall
+    if not (0 <= y < pixel_grid.shape[0] and 0 <= x < pixel_grid.shape[1]):
+        return WHITE
+
+    return pixel_grid[y, x]
+
+
+def draw_pixel_grid(canvas, pixel_grid):
+    """
+    Draws the pixel grid onto the canvas as a single image, so that what is shown is exactly what is checked.
+    :param canvas: The canvas in question.
+    :type canvas: tkinter.Canvas
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
+    :return: None
+    """
+    from PIL import Image, ImageTk
+
+    # Turn the color codes into a palette image
+    image = Image.fromarray(pixel_grid)
+    image.putpalette(COLOR_PALETTE)
+
+    # Tk doesn't keep a reference to the image, so it's stored on the canvas to keep it from being garbage collected
+    canvas.image = ImageTk.PhotoImage(image)
+    canvas.create_image(0, 0, anchor="nw", image=canvas.image)
+
+
+def fill_pixel_grid(pixel_grid, x0, y0, x1, y1, color):
+    """
+    Records the color of a filled rectangle in the pixel grid.
+    :param pixel_grid: The color codes of every pixel in the canvas.
+    :type pixel_grid: np.array
+    :param x0: The x coordinate of one corner of the rectangle.
+    :type x0: int
+    :param y0: The y coordinate of one corner of the rectangle.
+    :type y0: int
+    :param x1: The x coordinate of the opposite corner of the rectangle.
+    :type x1: int
+    :param y1: The y coordinate of the opposite corner of the rectangle.
+    :type y1: int
+    :param color: The color code of the rectangle.
+    :type color: int
+    :return: None
+    """
+    # The corners may be given in any order, and the outline covers the far edge as well
+    x0, x1 = sorted((int(x0), int(x1)))
+    y0, y1 = sorted((int(y0), int(y1)))
+    area = pixel_grid[max(y0, 0):y1 + 1, max(x0, 0):x1 + 1]
+
+    # Only overwrite pixels with a lower priority color
+    area[area < color] = color
 
 
 """
@@ -566,22 +626,11 @@ def get_alarm_state(server_address, server_port):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :return: alarm_state (int)
     """
-    connection = server_connection(server_address, server_port)
-
     # Request alarm state
-    command = "get_alarm_state"
-    connection.send(bytes(command, "utf-8"))
-
-    # Receive and decode response
-    msg = connection.recv(1024)
-    msg_decoded = msg.decode("utf-8")
-    alarm_state = int(msg_decoded)
-
-    # Close connection
-    connection.close()
+    alarm_state = int(send_command(server_address, server_port, "get_alarm_state", expect_response=True))
 
     return alarm_state
 
@@ -589,42 +638,89 @@ def get_alarm_state(server_address, server_port):
 def server_connection(server_address, server_port):
     """
     Creates a server connection and returns the socket.
+    The server reads a single unframed command from each connection, so every request needs a connection of its own.
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :return: s (socket.socket)
     """
-    # Create an INET streaming socket
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # Create an INET streaming socket for the resolved server address
+    family, socket_type, protocol, _, socket_address = resolve_server_address(server_address, server_port)
+    s = socket.socket(family, socket_type, protocol)
+
+    # Send commands right away, rather than letting Nagle's algorithm wait for an ACK to coalesce them
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
     # Connect to the server
-    s.connect((server_address, int(server_port)))
+    s.connect(socket_address)
+
+    # Acknowledge the server right away instead of arming the delayed ACK timer (only available on Linux)
+    if hasattr(socket, "TCP_QUICKACK"):
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
 
     # Return the socket
     return s
 
 
+@functools.lru_cache(maxsize=None)
+def resolve_server_address(server_address, server_port):
+    """
+    Looks up the IPv4 address of the server. The result is cached, so a host name is only resolved once.
+    :param server_address: The IP address or host name of the server.
+    :type server_address: str
+    :param server_port: The port number of the server.
+    :type server_port: int
+    :return: family (int), socket_type (int), protocol (int), canonical_name (str), socket_address (tuple)
+    """
+    return socket.getaddrinfo(server_address, server_port, socket.AF_INET, socket.SOCK_STREAM)[0]
+
+
+def send_command(server_address, server_port, command, expect_response=False):
+    """
+    Sends a command to the server, and returns the response if the command has one.
+    :param server_address: The IP address of the server.
+    :type server_address: str
+    :param server_port: The port number of the server.
+    :type server_port: int
+    :param command: The command to send.
+    :type command: str
+    :param expect_response: Whether the server responds to the command.
+    :type expect_response: bool
+    :return: response (str or None)
+    """
+    # Connect to server
+    connection = server_connection(server_address, server_port)
+
+    try:
+        # Send the whole command, which is always plain ASCII
+        connection.sendall(command.encode("ascii"))
+
+        # Receive and decode response
+        response = None
+        if expect_response:
+            response = connection.recv(1024).decode()
+
+    finally:
+        # Close connection, even if the server went away mid-request
+        connection.close()
+
+    return response
+
+
 def set_alarm_state(server_address, server_port, new_alarm_state):
     """
     Sets the value of alarm_state, which is stored in the database on the server.
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_alarm_state: The requested new value of alarm_state.
     :type new_alarm_state: int
     :return: None
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
     # Request changing alarm state
-    command = "set_alarm_state " + str(new_alarm_state)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    send_command(server_address, server_port, f"set_alarm_state {new_alarm_state}")
 
 
 def management(server_address, server_port):
@@ -634,26 +730,34 @@ def management(server_address, server_port):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :return: None
     """
     system = platform.system()
     not_done = True
 
+    # Only fetch the preferences again once they have been changed
+    preferences_changed = True
+    timezone_time_fetched = 0.0
+
     # While the user is not done changing settings
     while not_done:
-        # Clear the console
+        # Clear the console, using escape codes outside of Windows so no new process has to be started every time
         if system == "Windows":
             os.system("cls")
         else:
-            os.system("clear")
+            print("\x1b[2J\x1b[H", end="", flush=True)
 
         # Display the time of the chosen timezone - so as to give the user the ability to set the correct one
-        timezone_time = get_timezone_time(server_address, server_port)
+        if preferences_changed or time.monotonic() - timezone_time_fetched >= TIMEZONE_TIME_MAX_AGE:
+            timezone_time = get_timezone_time(server_address, server_port)
+            timezone_time_fetched = time.monotonic()
         display_timezone_time(timezone_time)
 
         # Display current preferences
-        user_preferences = load_user_preferences(server_address, server_port)
+        if preferences_changed:
+            user_preferences = load_user_preferences(server_address, server_port)
+            preferences_changed = False
         display_user_preferences(user_preferences)
 
         # Changing preferences
@@ -663,6 +767,7 @@ def management(server_address, server_port):
         if preference_to_change == 1:
             current_active_state = user_preferences["active_state"]
             change_active_state(server_address, server_port, current_active_state)
+            preferences_changed = True
 
         # If changing wakeup time
         elif preference_to_change == 2:
@@ -672,6 +777,7 @@ def management(server_address, server_port):
 
             change_wakeup_time(server_address, server_port, "hour", new_wakeup_hour)
             change_wakeup_time(server_address, server_port, "minute", new_wakeup_minute)
+            preferences_changed = True
 
         # If changing wakeup window
         elif preference_to_change == 3:
@@ -679,6 +785,7 @@ def management(server_address, server_port):
             new_wakeup_window = get_input("Please input new wakeup window (in minutes): ", "int", 0)
 
             change_wakeup_window(server_address, server_port, new_wakeup_window)
+            preferences_changed = True
 
         # If changing UTC offset
         elif preference_to_change == 4:
@@ -686,6 +793,7 @@ def management(server_address, server_port):
             new_utc_offset = get_input("Please input new UTC offset: ", "int", 0)
 
             change_utc_offset(server_address, server_port, new_utc_offset)
+            preferences_changed = True
 
         # If changing grace period
         elif preference_to_change == 5:
@@ -693,18 +801,21 @@ def management(server_address, server_port):
             new_grace_period = get_input("Please input new grace period: ", "int", 0)
 
             change_grace_period(server_address, server_port, new_grace_period)
+            preferences_changed = True
 
         elif preference_to_change == 6:
             print("Changing line thickness.")
             new_line_thickness = get_input("Please input new line thickness: ", "int", 0)
 
             change_line_thickness(server_address, server_port, new_line_thickness)
+            preferences_changed = True
 
         elif preference_to_change == 7:
             print("Changing precision mouse threshold.")
             new_precision_mouse_threshold = get_input("Please input new precision mouse threshold: ", "int", 0)
 
             change_precision_mouse_threshold(server_address, server_port, new_precision_mouse_threshold)
+            preferences_changed = True
 
 
 def get_timezone_time(server_address, server_port):
@@ -713,22 +824,11 @@ def get_timezone_time(server_address, server_port):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :return: timezone_time (list)
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
-    # Request user preferences
-    command = "get_timezone_time"
-    connection.send(bytes(command, "utf-8"))
-
-    # Receive and decode response
-    msg = connection.recv(1024)
-    timezone_time = msg.decode("utf-8")
-
-    # Close connection
-    connection.close()
+    # Request timezone time
+    timezone_time = send_command(server_address, server_port, "get_timezone_time", expect_response=True)
 
     return timezone_time
 
@@ -740,33 +840,11 @@ def display_timezone_time(timezone_time):
     :type timezone_time: str
     :return: None
     """
-    # Separates the string into hours, minutes and seconds
-    timezone_split = timezone_time.split(", ")
-    timezone_hours = timezone_split[0]
-    timezone_minutes = timezone_split[1]
-    timezone_seconds = timezone_split[2]
-
-    # Cleans the data and turns them into integers
-    timezone_hours = int(timezone_hours.split("[")[1])
-    timezone_minutes = int(timezone_minutes)
-    timezone_seconds = int(timezone_seconds.split("]")[0])
-
-    # Turns them back into strings as double digits with leading zeroes if necessary
-    if timezone_hours < 10:
-        timezone_hours = "0" + str(timezone_hours)
-    else:
-        timezone_hours = str(timezone_hours)
-    if timezone_minutes < 10:
-        timezone_minutes = "0" + str(timezone_minutes)
-    else:
-        timezone_minutes = str(timezone_minutes)
-    if timezone_seconds < 10:
-        timezone_seconds = "0" + str(timezone_seconds)
-    else:
-        timezone_seconds = str(timezone_seconds)
+    # Separates the string "[hours, minutes, seconds]" into integers
+    timezone_hours, timezone_minutes, timezone_seconds = map(int, timezone_time.strip("[]").split(","))
 
-    # Prints the result to screen
-    print(f"Current time in chosen timezone: {timezone_hours}:{timezone_minutes}:{timezone_seconds}")
+    # Prints the result to screen, as double digits with leading zeroes if necessary
+    print(f"Current time in chosen timezone: {timezone_hours:02d}:{timezone_minutes:02d}:{timezone_seconds:02d}")
 
 
 def load_user_preferences(server_address, server_port):
@@ -775,25 +853,17 @@ def load_user_preferences(server_address, server_port):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :return: user_preferences (dict)
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
     # Request user preferences
-    command = "get_user_preferences"
-    connection.send(bytes(command, "utf-8"))
+    user_preferences = send_command(server_address, server_port, "get_user_preferences", expect_response=True)
 
-    # Receive and decode response
-    msg = connection.recv(1024)
-    user_preferences = msg.decode("utf-8")
-
-    # Close connection
-    connection.close()
-
-    # Convert to dictionary
-    user_preferences = ast.literal_eval(user_preferences)
+    # Convert to dictionary, falling back to a Python literal for servers that don't send JSON yet
+    try:
+        user_preferences = json.loads(user_preferences)
+    except json.JSONDecodeError:
+        user_preferences = ast.literal_eval(user_preferences)
 
     return user_preferences
 
@@ -811,19 +881,9 @@ def display_user_preferences(user_preferences):
         print("Yes")
     else:
         print("No")
-    print("2.\tWakeup time:\t", end="")
-    if user_preferences["wakeup_time_hour"] < 10:
-        print("0", end="")
-    print(str(user_preferences["wakeup_time_hour"]) + ":", end="")
-    if user_preferences["wakeup_time_minute"] < 10:
-        print("0", end="")
-    print(str(user_preferences["wakeup_time_minute"]))
+    print(f"2.\tWakeup time:\t{user_preferences['wakeup_time_hour']:02d}:{user_preferences['wakeup_time_minute']:02d}")
     print("3.\tWakeup window:\t" + str(user_preferences["wakeup_window"]) + " minutes")
-    if user_preferences["utc_offset"] > 0:
-        utc_prefix = "+"
-    else:
-        utc_prefix = ""
-    print("4.\tUTC offset:\t" + utc_prefix + str(user_preferences["utc_offset"]))
+    print(f"4.\tUTC offset:\t{user_preferences['utc_offset']:+d}")
     print("5.\tGrace period:\t" + str(user_preferences["grace_period"]) + " minutes")
     print("6.\tLine thickness:\t" + str(user_preferences["line_thickness"]) + " pixels")
     print("7.\tPrecision thrs:\t" + str(user_preferences["precision_mouse_threshold"]) + " pixels")
@@ -835,7 +895,7 @@ def change_active_state(server_address, server_port, current_active_state):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param current_active_state: What the active state was before calling this function.
     :type current_active_state: int
     :return: None
@@ -852,20 +912,13 @@ def set_active_state(server_address, server_port, new_active_state):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_active_state: The new active state.
     :type new_active_state: int
     :return: None
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
-    # Request changing alarm state
-    command = "set_active_state " + str(new_active_state)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    # Request changing active state
+    send_command(server_address, server_port, f"set_active_state {new_active_state}")
 
 
 def get_input(prompt, expected_type, speed):
@@ -875,37 +928,40 @@ def get_input(prompt, expected_type, speed):
     :type prompt: str
     :param expected_type: The expected type of the given value.
     :type expected_type: str
-    :param speed: How much time the program shall wait before asking the user for a new value if the previous one
-    was invalid.
+    :param speed: How much time the program shall wait, per failed attempt, before asking the user for a new value
+    once more than one value has been invalid. The first invalid value is asked for again right away.
     :type speed: int
     :return: user_input (any)
     """
     # Instantiate variables
     user_input = None
     user_input_ok = False
+    attempts = 0
 
     # While user input is not in the correct format (default on first attempt)
     while not user_input_ok:
         # Prints the desired prompt, which usually describes what kind of information is requested
-        print(prompt, end="")
+        print(prompt, end="", flush=True)
 
         # Stores the input and checks if it's in the correct format
         user_input = input()
-        is_ok, reason = is_clean_input(expected_type, user_input)
+        is_ok, reason, parsed_input = is_clean_input(expected_type, user_input)
 
         if is_ok:
             # Breaks the loop
             user_input_ok = True
         else:
-            # Asks for another attempt
-            print(f"You did enter a correct value. Reason: {reason}.")
-            if speed > 0:
-                print(f"Please try again in {speed} seconds.")
-            time.sleep(speed)
-
-    # If the expected input type is an integer, make sure it converts from string (user input) to integer
-    if expected_type == "int":
-        user_input = int(user_input)
+            # Asks for another attempt, waiting longer for every repeated failure
+            print(f"You did enter a correct value. Reason: {reason}.", flush=True)
+            attempts += 1
+            delay = min(speed * attempts, MAX_INPUT_RETRY_DELAY)
+            if attempts >= 2 and delay > 0:
+                print(f"Please try again in {delay} seconds.", flush=True)
+                time.sleep(delay)
+
+    # If the input was converted to the expected type while testing it, use the converted value
+    if parsed_input is not None:
+        user_input = parsed_input
 
     return user_input
 
@@ -913,36 +969,44 @@ def get_input(prompt, expected_type, speed):
 def is_clean_input(expected_type, value):
     """
     Tests if the given value is not empty and that it is of the expected type.
-    :param expected_type: The expected type of the given value.
+    :param expected_type: The expected type of the given value, one of the keys in INPUT_VALIDATORS.
     :type: str
     :param value: The value to test.
     :type value: str
-    :return: is_clean (bool), reason (str)
+    :return: is_clean (bool), reason (str), parsed_value (any, None if not clean)
     """
-    # Instantiate variables
-    is_clean = False
-    reason = ""
-
-    # Checks if correct integer input
-    if expected_type == "int":
-        # If not empty
-        if value != "":
-            try:
-                # If possible to convert to int
-                int(value)
-                is_clean = True
-
-                # If not possible to convert to int
-            except ValueError:
-                is_clean = False
-                reason = "ValueError"
-
-        # If empty
-        else:
-            is_clean = False
-            reason = "Empty"
+    # Runs the test belonging to the expected type
+    return INPUT_VALIDATORS[expected_type](value)
+
+
+def validate_int_input(value):
+    """
+    Tests if the given value is not empty and that it is an integer.
+    :param value: The value to test.
+    :type value: str
+    :return: is_clean (bool), reason (str), parsed_value (int, None if not clean)
+    """
+    # If empty
+    if value == "":
+        return False, "Empty", None
+
+    # Allows surrounding whitespace and a single leading sign, like int() does
+    stripped_value = value.strip()
+    if stripped_value[:1] in ("-", "+"):
+        digits = stripped_value[1:]
+    else:
+        digits = stripped_value
+
+    # If possible to convert to int. Checking the digits up front is cheaper than letting int() raise a ValueError
+    if digits.isdecimal():
+        return True, "", int(stripped_value)
+
+    # If not possible to convert to int
+    return False, "ValueError", None
 
-    return is_clean, reason
+
+# The test for each type of input that can be asked for
+INPUT_VALIDATORS = {"int": validate_int_input}
 
 
 def change_wakeup_time(server_address, server_port, hour_or_minute, value):
@@ -951,22 +1015,15 @@ def change_wakeup_time(server_address, server_port, hour_or_minute, value):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param hour_or_minute: Either 'hour' or 'minute'.
     :type hour_or_minute: str
     :param value: The new value for the given type.
     :type value: int
     :return: None
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
-    # Request changing alarm state
-    command = "set_wakeup_" + hour_or_minute + " " + str(value)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    # Request changing wakeup time
+    send_command(server_address, server_port, f"set_wakeup_{hour_or_minute} {value}")
 
 
 def change_wakeup_window(server_address, server_port, new_wakeup_window):
@@ -975,20 +1032,13 @@ def change_wakeup_window(server_address, server_port, new_wakeup_window):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_wakeup_window: The new wakeup window in minutes.
     :type new_wakeup_window: int
     :return: None
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
-    # Request changing alarm state
-    command = "set_wakeup_window " + str(new_wakeup_window)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    # Request changing wakeup window
+    send_command(server_address, server_port, f"set_wakeup_window {new_wakeup_window}")
 
 
 def change_utc_offset(server_address, server_port, new_utc_offset):
@@ -997,20 +1047,13 @@ def change_utc_offset(server_address, server_port, new_utc_offset):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_utc_offset: The new UTC offset in minutes.
     :type new_utc_offset: int
     :return: None
     """
-    # Connect to server
-    connection = server_connection(server_address, server_port)
-
-    # Request changing alarm state
-    command = "set_utc_offset " + str(new_utc_offset)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    # Request changing UTC offset
+    send_command(server_address, server_port, f"set_utc_offset {new_utc_offset}")
 
 
 def change_grace_period(server_address, server_port, new_grace_period):
@@ -1019,20 +1062,13 @@ def change_grace_period(server_address, server_port, new_grace_period):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_grace_period: The new grace period in minutes.
     :type new_grace_period: int
     :return: None
     """
-    # Connect to the server
-    connection = server_connection(server_address, server_port)
-
     # Request changing grace period
-    command = "set_grace_period " + str(new_grace_period)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    send_command(server_address, server_port, f"set_grace_period {new_grace_period}")
 
 
 def change_line_thickness(server_address, server_port, new_line_thickness):
@@ -1041,20 +1077,13 @@ def change_line_thickness(server_address, server_port, new_line_thickness):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_line_thickness: The new line thickness in amount of pixels.
     :type new_line_thickness: int
     :return: None
     """
-    # Connect to the server
-    connection = server_connection(server_address, server_port)
-
-    # Request changing grace period
-    command = "set_line_thickness " + str(new_line_thickness)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    # Request changing line thickness
+    send_command(server_address, server_port, f"set_line_thickness {new_line_thickness}")
 
 
 def change_precision_mouse_threshold(server_address, server_port, new_precision_mouse_threshold):
@@ -1064,20 +1093,13 @@ def change_precision_mouse_threshold(server_address, server_port, new_precision_
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
     :param new_precision_mouse_threshold: The new precision mouse threshold in amount of pixels.
     :type new_precision_mouse_threshold: int
     :return: None
     """
-    # Connect to the server
-    connection = server_connection(server_address, server_port)
-
-    # Request changing grace period
-    command = "set_line_thickness " + str(new_precision_mouse_threshold)
-    connection.send(bytes(command, "utf-8"))
-
-    # Close connection
-    connection.close()
+    # Request changing precision mouse threshold
+    send_command(server_address, server_port, f"set_precision_mouse_threshold {new_precision_mouse_threshold}")
 
 
 def get_line_thickness(server_address, server_port):
@@ -1086,21 +1108,11 @@ def get_line_thickness(server_address, server_port):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
+    :return: line_thickness (int)
     """
-    connection = server_connection(server_address, server_port)
-
-    # Request alarm state
-    command = "get_line_thickness"
-    connection.send(bytes(command, "utf-8"))
-
-    # Receive and decode response
-    msg = connection.recv(1024)
-    msg_decoded = msg.decode("utf-8")
-    line_thickness = int(msg_decoded)
-
-    # Close connection
-    connection.close()
+    # Request line thickness
+    line_thickness = int(send_command(server_address, server_port, "get_line_thickness", expect_response=True))
 
     return line_thickness
 
@@ -1111,21 +1123,12 @@ def get_precision_mouse_threshold(server_address, server_port):
     :param server_address: The IP address of the server.
     :type server_address: str
     :param server_port: The port number of the server.
-    :type server_port: str
+    :type server_port: int
+    :return: precision_mouse_threshold (int)
     """
-    connection = server_connection(server_address, server_port)
-
-    # Request alarm state
-    command = "get_precision_mouse_threshold"
-    connection.send(bytes(command, "utf-8"))
-
-    # Receive and decode response
-    msg = connection.recv(1024)
-    msg_decoded = msg.decode("utf-8")
-    precision_mouse_threshold = int(msg_decoded)
-
-    # Close connection
-    connection.close()
+    # Request precision mouse threshold
+    precision_mouse_threshold = int(send_command(server_address, server_port, "get_precision_mouse_threshold",
+                                                 expect_response=True))
 
     return precision_mouse_threshold
 